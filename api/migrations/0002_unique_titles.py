@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-14 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='title',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='menuitem',
+            name='title',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -4,14 +4,14 @@ from django.contrib.auth.models import User
 # category model
 class Category(models.Model):
     slug = models.SlugField()
-    title = models.CharField(max_length=255, db_index=True)
+    title = models.CharField(max_length=255, unique=True)
 
     def __str__(self) -> str:
         return self.title
  
 # menue item model
 class MenuItem(models.Model):
-    title = models.CharField(max_length=255, db_index=True)
+    title = models.CharField(max_length=255, unique=True)
     price = models.DecimalField(max_digits=6, decimal_places=2, db_index=True)
     featured = models.BooleanField(db_index=True)
     category = models.ForeignKey(Category, on_delete=models.PROTECT)
@@ -0,0 +1,50 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+import orjson
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes with orjson.
+
+    Produces compact UTF-8 JSON like `JSONRenderer`, but the encoding runs in orjson's
+    native code instead of the standard library's `json` module. Types orjson does not
+    know (e.g. Decimal or lazy translation strings) are passed to DRF's JSON encoder,
+    and so are dates, times and dataclasses, which orjson would otherwise format
+    differently. Non-string dict keys are converted to strings, as `json` does. Float
+    formatting can still differ slightly (orjson writes `1e16` where `json` writes
+    `1e+16`); both are valid JSON for the same value.
+
+    Two inputs are not rejected the way `JSONRenderer` rejects them: NaN and Infinity are
+    written as `null` instead of raising a ValueError (DRF's `STRICT_JSON` setting is not
+    applied), and plain Enum members are encoded as their value instead of raising a
+    TypeError. Scanning every response for them would cost more than the faster encoding
+    saves, so views should not return them.
+
+    Falls back to `JSONRenderer` when the output has to be indented or ASCII-only (e.g. in
+    the browsable API), or when orjson cannot encode the data (e.g. integers wider than
+    64 bits).
+    """
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if (
+            data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self._encoder.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape \u2028 and \u2029 like JSONRenderer, to keep the output a strict javascript subset.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
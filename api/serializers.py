@@ -1,57 +1,90 @@
 from rest_framework import serializers
 from .models import *
-from datetime import datetime
-from rest_framework.validators import UniqueValidator
+from django.utils import timezone
+from django.db import IntegrityError, transaction
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class UniqueTitleMixin:
+    """
+    Mixin for serializers of models with a unique `title` column.
+
+    Uniqueness is enforced by the database constraint instead of a `UniqueValidator`,
+    which would run an extra SELECT before every save. When a save fails with an
+    IntegrityError, the title is looked up once to tell a duplicate title, reported as
+    a validation error on the 'title' field, from any other failed constraint, which
+    is re-raised.
+
+    Attributes:
+        unique_title_message (str): The error message returned for a duplicate title.
+    """
+    unique_title_message = 'This title already exists'
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if self.is_duplicate_title(validated_data):
+                raise serializers.ValidationError({'title': [self.unique_title_message]})
+            raise
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            if self.is_duplicate_title(validated_data, instance):
+                raise serializers.ValidationError({'title': [self.unique_title_message]})
+            raise
+
+    def is_duplicate_title(self, validated_data, instance=None):
+        """
+        Returns True if another row already uses the title being saved.
+        """
+        if 'title' not in validated_data:
+            return False
+        others = self.Meta.model.objects.filter(title=validated_data['title'])
+        if instance is not None:
+            others = others.exclude(pk=instance.pk)
+        return others.exists()
+
+
+class CategorySerializer(UniqueTitleMixin, serializers.ModelSerializer):
     """
     Serializer class for the Category model.
 
     This serializer is used to convert Category model instances into JSON
     representation and vice versa. It specifies the fields to be included in
-    the serialized output and provides validation for the 'title' field.
+    the serialized output and reports duplicate 'title' values.
 
     Attributes:
         model (Category): The Category model class to be serialized.
         fields (list): The list of fields to be included in the serialized output.
         extra_kwargs (dict): Additional keyword arguments for field-level configuration.
     """
+    unique_title_message = "This category already exists"
+
     class Meta:
         model = Category
         fields = ['id', 'title']
         extra_kwargs = {
-            'title': {
-                'validators': [
-                    UniqueValidator(
-                        queryset=Category.objects.all(),
-                        message="This category already exists"
-                    )
-                ]
-            },
+            'title': {'validators': []},
         }
 
-class MenuItemSerializer(serializers.ModelSerializer):
+class MenuItemSerializer(UniqueTitleMixin, serializers.ModelSerializer):
     category = serializers.SlugRelatedField(queryset=Category.objects.all(), slug_field='title', required=True)
 
     class Meta:
         model = MenuItem
         fields = ['id', 'title', 'price', 'featured', 'category']
         extra_kwargs = {
-            'title': {
-                'validators': [
-                    UniqueValidator(
-                        queryset=MenuItem.objects.all(),
-                        message="This title already exists"
-                    )
-                ]
-            },
+            'title': {'validators': []},
         }
         depth = 1
 
 class UserSerializer(serializers.ModelSerializer):
     Date_Joined = serializers.SerializerMethodField()
-    date_joined = serializers.DateTimeField(write_only=True, default=datetime.now)
+    date_joined = serializers.DateTimeField(write_only=True, required=False, default=timezone.now)
     email = serializers.EmailField(required=False)
 
     class Meta:
@@ -1,3 +1,68 @@
-from django.test import TestCase
+from decimal import Decimal
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APITestCase
+from .models import Category, MenuItem, Cart, Order, OrderItem
 
-# Create your tests here.
+
+class OrdersViewPermissionsTest(APITestCase):
+    """
+    Tests the permissions required by each request method on the orders endpoint.
+    """
+
+    def setUp(self):
+        self.customer = User.objects.create_user('customer', 'customer@example.com', 'password')
+        self.manager = User.objects.create_user('manager', 'manager@example.com', 'password')
+        self.manager.groups.add(Group.objects.create(name='Manager'))
+
+    def test_customer_can_use_read_only_methods(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+        self.assertEqual(self.client.head('/api/orders/').status_code, 200)
+        self.assertEqual(self.client.options('/api/orders/').status_code, 200)
+
+    def test_customer_cannot_use_write_methods_other_than_post(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.delete('/api/orders/').status_code, 403)
+        self.assertEqual(self.client.put('/api/orders/').status_code, 403)
+
+    def test_manager_passes_write_permission_check(self):
+        self.client.force_authenticate(self.manager)
+        # The permission check passes; the list endpoint itself does not implement DELETE.
+        self.assertEqual(self.client.delete('/api/orders/').status_code, 405)
+
+    def test_anonymous_user_is_rejected(self):
+        self.assertEqual(self.client.get('/api/orders/').status_code, 401)
+
+
+class OrderPlacementTest(APITestCase):
+    """
+    Tests placing an order from the items in the customer's cart.
+    """
+
+    def setUp(self):
+        self.customer = User.objects.create_user('customer', 'customer@example.com', 'password')
+        category = Category.objects.create(slug='mains', title='Mains')
+        self.pasta = MenuItem.objects.create(title='Pasta', price=Decimal('8.50'), featured=False, category=category)
+        self.salad = MenuItem.objects.create(title='Salad', price=Decimal('4.25'), featured=False, category=category)
+        self.client.force_authenticate(self.customer)
+
+    def test_order_is_placed_from_cart(self):
+        self.client.post('/api/cart/menu-items/', {'menuitem': self.pasta.id, 'quantity': 2})
+        self.client.post('/api/cart/menu-items/', {'menuitem': self.salad.id, 'quantity': 1})
+
+        response = self.client.post('/api/orders/')
+
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(user=self.customer)
+        self.assertEqual(order.total, Decimal('21.25'))
+        self.assertEqual(
+            set(OrderItem.objects.filter(order=order).values_list('menuitem_id', 'quantity')),
+            {(self.pasta.id, 2), (self.salad.id, 1)},
+        )
+        self.assertFalse(Cart.objects.filter(user=self.customer).exists())
+
+    def test_empty_cart_is_rejected(self):
+        response = self.client.post('/api/orders/')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
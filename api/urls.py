@@ -1,16 +1,26 @@
-from django.urls import path
+from django.urls import path, include
 from .views import *
 
 urlpatterns = [
     path('logout-all-devices', LogoutAllView.as_view(), name='auth_logout'),
     path('menu-items', MenuItemView.as_view()),
-    path('menu-items/category', CategoryView.as_view()),
-    path('menu-items/<int:pk>', SingleItemView.as_view()),
-    path('groups/manager/users/', ManagerUsersView.as_view()),
-    path('groups/manager/users/<int:pk>/', ManagerSingleUserView.as_view()),
-    path('groups/delivery-crew/users/', Delivery_crew_management.as_view()),
-    path('groups/delivery-crew/users/<int:pk>/', Delivery_crew_management_single_view.as_view()),
+    path('menu-items/', include([
+        path('category', CategoryView.as_view()),
+        path('<int:pk>', SingleItemView.as_view()),
+    ])),
+    path('groups/', include([
+        path('manager/users/', include([
+            path('', ManagerUsersView.as_view()),
+            path('<int:pk>/', ManagerSingleUserView.as_view()),
+        ])),
+        path('delivery-crew/users/', include([
+            path('', Delivery_crew_management.as_view()),
+            path('<int:pk>/', Delivery_crew_management_single_view.as_view()),
+        ])),
+    ])),
     path('cart/menu-items/', Customer_Cart.as_view()),
-    path('orders/', OrdersView.as_view()),
-    path('orders/<int:pk>', SingleOrderView.as_view()),
-]
\ No newline at end of file
+    path('orders/', include([
+        path('', OrdersView.as_view()),
+        path('<int:pk>', SingleOrderView.as_view()),
+    ])),
+]
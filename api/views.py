@@ -1,12 +1,15 @@
+import json
 from datetime import date
 from decimal import Decimal
 from .serializers import *
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework import generics
 from django.contrib.auth.models import User, Group
+from django.db import transaction
+from django.db.models import F
 from .permissions import IsManager, IsDeliveryCrew
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import OutstandingToken, BlacklistedToken
@@ -14,6 +17,38 @@ from rest_framework.response import Response
 from rest_framework import status
 
 
+# The only User columns read by UserSerializer.
+_USER_FIELDS = ('id', 'username', 'email', 'date_joined')
+
+
+def _encode_message(message):
+    """
+    Returns the JSON body of a response carrying only a fixed message.
+
+    Encoding the fixed messages once at import spares a json.dumps call on every request.
+    """
+    return json.dumps({'message': message}).encode()
+
+
+_LOGOUT_SUCCESSFUL = _encode_message('Logout successful from all devices')
+_ADDED_TO_MANAGERS = _encode_message('User added to Managers group')
+_ADDED_TO_DELIVERY_CREW = _encode_message('User added to Delivery Crew')
+_ADDED_TO_CART = _encode_message('Item added to cart!')
+_REMOVED_FROM_CART = _encode_message('Item removed from cart')
+_CART_CLEARED = _encode_message('All Items removed from cart')
+_CART_EMPTY = _encode_message('Your cart is empty')
+
+# Composed permission classes, built once instead of in every view that needs them.
+_MANAGER_OR_ADMIN = IsManager | IsAdminUser
+_DELIVERY_OR_MANAGER_OR_ADMIN = IsDeliveryCrew | IsManager | IsAdminUser
+
+# Permission checks are stateless, so one set of instances is shared across requests.
+_ALLOW_ANY = (AllowAny(),)
+_ADMIN_ONLY = (IsAdminUser(),)
+_AUTHENTICATED = (IsAuthenticated(),)
+_AUTHENTICATED_MANAGER_OR_ADMIN = (IsAuthenticated(), _MANAGER_OR_ADMIN())
+
+
 class LogoutAllView(APIView):
     """
     API view for logging out the user from all devices.
@@ -38,13 +73,15 @@ class LogoutAllView(APIView):
         - request: The HTTP request object.
 
         Returns:
-        - JsonResponse: A JSON response with a success message and a status code of 205 (RESET_CONTENT).
+        - HttpResponse: A JSON response with a success message and a status code of 205 (RESET_CONTENT).
         """
-        tokens = OutstandingToken.objects.filter(user_id=request.user.id)
-        for token in tokens:
-            t, _ = BlacklistedToken.objects.get_or_create(token=token)
+        token_ids = OutstandingToken.objects.filter(user_id=request.user.id).values_list('id', flat=True)
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+            ignore_conflicts=True
+        )
 
-        return JsonResponse({'message': 'Logout successful from all devices'}, status=status.HTTP_205_RESET_CONTENT)
+        return HttpResponse(_LOGOUT_SUCCESSFUL, status=status.HTTP_205_RESET_CONTENT, content_type='application/json')
 
 class SingleItemView(generics.RetrieveUpdateDestroyAPIView, generics.RetrieveAPIView):
     """
@@ -58,31 +95,33 @@ class SingleItemView(generics.RetrieveUpdateDestroyAPIView, generics.RetrieveAPI
         queryset (QuerySet): The queryset of MenuItem objects.
         serializer_class (Serializer): The serializer class for MenuItem objects.
         throttle_classes (list): The list of throttle classes to apply for rate limiting.
+        method_permissions (dict): The permission instances for request methods with extra requirements.
+        default_permissions (tuple): The permission instances for every other request method.
 
     Methods:
-        get_permissions: Returns the list of permission classes based on the request method.
+        get_permissions: Returns the permission instances based on the request method.
         patch: Updates the featured status of a MenuItem and returns a JSON response.
 
     """
 
-    queryset = MenuItem.objects.all()
+    queryset = MenuItem.objects.select_related('category').all()
     serializer_class = MenuItemSerializer
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    method_permissions = {
+        'PATCH': _AUTHENTICATED_MANAGER_OR_ADMIN,
+        'DELETE': (IsAuthenticated(), IsAdminUser()),
+    }
+    default_permissions = _AUTHENTICATED
 
     def get_permissions(self):
         """
-        Returns the list of permission classes based on the request method.
+        Returns the permission instances based on the request method.
 
         Returns:
-            list: The list of permission classes.
+            tuple: The permission instances.
 
         """
-        permission_classes = [IsAuthenticated]
-        if self.request.method == 'PATCH':
-            permission_classes = [IsAuthenticated, IsManager | IsAdminUser]
-        if self.request.method == "DELETE":
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return[permission() for permission in permission_classes]
+        return self.method_permissions.get(self.request.method, self.default_permissions)
 
     def patch(self, request, *args, **kwargs):
         """
@@ -97,12 +136,11 @@ class SingleItemView(generics.RetrieveUpdateDestroyAPIView, generics.RetrieveAPI
             JsonResponse: The JSON response containing the updated featured status.
 
         """
-        menuitem = MenuItem.objects.get(pk=self.kwargs['pk'])
-        menuitem.featured = not menuitem.featured
-        menuitem.save()
+        MenuItem.objects.filter(pk=self.kwargs['pk']).update(featured=~F('featured'))
+        menuitem = get_object_or_404(MenuItem.objects.values('title', 'featured'), pk=self.kwargs['pk'])
         return JsonResponse(
             status=200, 
-            data={'message':'Featured status of {} changed to {}'.format(str(menuitem.title) ,str(menuitem.featured))}
+            data={'message':'Featured status of {} changed to {}'.format(str(menuitem['title']) ,str(menuitem['featured']))}
         )
 
 class CategoryView(generics.ListAPIView, generics.ListCreateAPIView):
@@ -117,30 +155,32 @@ class CategoryView(generics.ListAPIView, generics.ListCreateAPIView):
         serializer_class (Serializer): The serializer class to be used for serializing and deserializing Category objects.
         search_fields (list): The fields to be used for searching Category objects.
         throttle_classes (list): The throttle classes to be used for rate limiting.
+        method_permissions (dict): The permission instances to be used for each restricted request method.
+        default_permissions (tuple): The permission instances to be used for every other request method.
 
     Methods:
-        get_permissions: Returns the list of permissions classes based on the request method.
+        get_permissions: Returns the permission instances based on the request method.
 
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     search_fields = ['title']
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    method_permissions = {'POST': _ADMIN_ONLY}
+    default_permissions = _ALLOW_ANY
 
     def get_permissions(self):
         """
-        Returns the list of permissions classes based on the request method.
+        Returns the permission instances based on the request method.
 
-        If the request method is POST, returns a list containing `IsAdminUser` permission class.
-        Otherwise, returns a list containing `AllowAny` permission class.
+        If the request method is POST, returns an `IsAdminUser` permission.
+        Otherwise, returns an `AllowAny` permission.
 
         Returns:
-            list: The list of permissions classes.
+            tuple: The permission instances.
 
         """
-        if self.request.method == 'POST': 
-            return [IsAdminUser()]
-        return [AllowAny()]
+        return self.method_permissions.get(self.request.method, self.default_permissions)
 
 
 class MenuItemView(generics.ListAPIView, generics.ListCreateAPIView):
@@ -156,79 +196,81 @@ class MenuItemView(generics.ListAPIView, generics.ListCreateAPIView):
         ordering_fields (list): The fields that can be used for ordering menu items.
         search_fields (list): The fields that can be used for searching menu items.
         throttle_classes (list): The throttle classes applied to the view.
+        method_permissions (dict): The permissions required for each restricted request method.
+        default_permissions (tuple): The permissions required for every other request method.
 
     Methods:
         get_permissions: Returns the permissions required for the request method.
 
     """
-    queryset = MenuItem.objects.all()
+    queryset = MenuItem.objects.select_related('category').all()
     serializer_class = MenuItemSerializer
     ordering_fields = ['price', 'category']
     search_fields = ['title', 'category__title']
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    method_permissions = {'POST': _ADMIN_ONLY}
+    default_permissions = _ALLOW_ANY
 
     def get_permissions(self):
         """
         Returns the permissions required for the request method.
 
         Returns:
-            list: A list of permission classes required for the request method.
+            tuple: The permission instances required for the request method.
         """
-        if self.request.method == 'POST':
-            return [IsAdminUser()]
-        return [AllowAny()]
+        return self.method_permissions.get(self.request.method, self.default_permissions)
 
 
 class ManagerUsersView(generics.ListCreateAPIView):
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     queryset = User.objects.filter(groups__name='Managers')
     serializer_class = UserSerializer
-    permission_classes = [IsAuthenticated, IsManager | IsAdminUser]
+    permission_classes = [IsAuthenticated, _MANAGER_OR_ADMIN]
 
     def get_queryset(self):
-        manager_group = Group.objects.get(name='Manager')
-        queryset = User.objects.filter(groups=manager_group)
+        queryset = User.objects.filter(groups__name='Manager').only(*_USER_FIELDS)
         return queryset
 
     def post(self, request, *args, **kwargs):
         username = request.data['username']
         if username:
             user = get_object_or_404(User, username=username)
-            managers = Group.objects.get(name='Manager')
+            managers = get_object_or_404(Group, name='Manager')
             managers.user_set.add(user)
-            return JsonResponse(status=201, data={'message':'User added to Managers group'})
+            return HttpResponse(_ADDED_TO_MANAGERS, status=201, content_type='application/json')
         
 class ManagerSingleUserView(generics.RetrieveDestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
 
     def get_queryset(self):
-        manager_group = Group.objects.get(name='Manager')
-        queryset = User.objects.filter(groups=manager_group)
+        queryset = User.objects.filter(groups__name='Manager').only(*_USER_FIELDS)
         return queryset
     
 class Delivery_crew_management(generics.ListCreateAPIView):
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     serializer_class = UserSerializer
-    permission_classes = [IsAuthenticated, IsManager | IsAdminUser]
-    queryset = User.objects.filter(groups=Group.objects.get(name="Delivery Crew"))
+    permission_classes = [IsAuthenticated, _MANAGER_OR_ADMIN]
+
+    def get_queryset(self):
+        queryset = User.objects.filter(groups__name='Delivery Crew').only(*_USER_FIELDS)
+        return queryset
 
     def post(self, request, *args, **kwargs):
         # Assign user to delivery crew
         username = request.data['username']
         if username:
             user = get_object_or_404(User, username=username)
-            delivery_crew = Group.objects.get(name='Delivery Crew')
+            delivery_crew = get_object_or_404(Group, name='Delivery Crew')
             delivery_crew.user_set.add(user)
-            return JsonResponse(status=201, data={'message':'User added to Delivery Crew'})
+            return HttpResponse(_ADDED_TO_DELIVERY_CREW, status=201, content_type='application/json')
 
 class Delivery_crew_management_single_view(generics.RetrieveDestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser, IsManager]
 
     def get_queryset(self):
-        delivery_crew = Group.objects.get(name='Delivery Crew')
-        queryset = User.objects.filter(groups=delivery_crew)
+        queryset = User.objects.filter(groups__name='Delivery Crew').only(*_USER_FIELDS)
         return queryset
 
 class Customer_Cart(generics.ListCreateAPIView):
@@ -236,21 +278,20 @@ class Customer_Cart(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self, *args, **kwargs):
-        cart = Cart.objects.filter(user=self.request.user)
+        cart = Cart.objects.filter(user=self.request.user).select_related('menuitem')
         return cart
 
     def post(self, request, *args, **kwargs):
         serialized_item = AddToCartSerializer(data=request.data)
         serialized_item.is_valid(raise_exception=True)
-        id = request.data['menuitem']
-        quantity = request.data['quantity']
-        item = get_object_or_404(MenuItem, id=id)
-        price = int(quantity) * item.price
+        item = serialized_item.validated_data['menuitem']
+        quantity = serialized_item.validated_data['quantity']
+        price = quantity * item.price
         try:
-            Cart.objects.create(user=request.user, quantity=quantity, unit_price=item.price, price=price, menuitem_id=id)
+            Cart.objects.create(user=request.user, quantity=quantity, unit_price=item.price, price=price, menuitem=item)
         except Exception as e:
             return JsonResponse(data={'message': f'{e}'})
-        return JsonResponse(status=201, data={'message':'Item added to cart!'})
+        return HttpResponse(_ADDED_TO_CART, status=201, content_type='application/json')
 
     def delete(self, request, *arg, **kwargs):
         if 'menuitem' in request.data:
@@ -259,73 +300,82 @@ class Customer_Cart(generics.ListCreateAPIView):
             menuitem = request.data['menuitem']
             cart = get_object_or_404(Cart, user=request.user, menuitem=menuitem )
             cart.delete()
-            return JsonResponse(status=200, data={'message':'Item removed from cart'})
+            return HttpResponse(_REMOVED_FROM_CART, status=200, content_type='application/json')
         else:
             Cart.objects.filter(user=request.user).delete()
-            return JsonResponse(status=201, data={'message':'All Items removed from cart'})
+            return HttpResponse(_CART_CLEARED, status=201, content_type='application/json')
 
 
 class OrdersView(generics.ListCreateAPIView):
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     serializer_class = OrdersSerializer
+    method_permissions = {method: _AUTHENTICATED for method in SAFE_METHODS + ('POST',)}
+    default_permissions = _AUTHENTICATED_MANAGER_OR_ADMIN
 
     def get_queryset(self, *args, **kwargs):
-        if self.request.user.groups.filter(name='Manager').exists() or self.request.user.is_superuser == True:
-            query = Order.objects.all()
-        elif self.request.user.groups.filter(name='Delivery Crew').exists():
-            query = Order.objects.filter(delivery_crew=self.request.user)
+        orders = Order.objects.select_related('user').only(
+            'id', 'total', 'status', 'delivery_crew', 'date',
+            'user__id', 'user__username', 'user__email', 'user__date_joined',
+        )
+        user = self.request.user
+        if user.is_superuser:
+            return orders
+        groups = set(user.groups.filter(name__in=['Manager', 'Delivery Crew']).values_list('name', flat=True))
+        if 'Manager' in groups:
+            query = orders.all()
+        elif 'Delivery Crew' in groups:
+            query = orders.filter(delivery_crew=user)
         else:
-            query = Order.objects.filter(user=self.request.user)
+            query = orders.filter(user=user)
         return query
 
     def get_permissions(self):
-        if self.request.method == 'GET' or 'POST' :
-            permission_classes = [IsAuthenticated]
-        else:
-            permission_classes = [IsAuthenticated, IsManager | IsAdminUser]
-        return[permission() for permission in permission_classes]
+        return self.method_permissions.get(self.request.method, self.default_permissions)
 
+    @transaction.atomic
     def post(self, request, *args, **kwargs):
-        cart_items = Cart.objects.filter(user=request.user)
+        # Lock the cart rows and build the whole order from them, so rows added by a
+        # concurrent request are neither charged, dropped nor ordered twice.
+        cart_items = list(
+            Cart.objects.select_for_update().filter(user=request.user).values('id', 'menuitem_id', 'quantity', 'price')
+        )
+        if not cart_items:
+            return HttpResponse(_CART_EMPTY, status=400, content_type='application/json')
         total = self.calculate_total(cart_items)
         order = Order.objects.create(user=request.user, status=False, total=total, date=date.today())
-        for i in cart_items.values():
-            menuitem = get_object_or_404(MenuItem, id=i['menuitem_id'])
-            orderitem = OrderItem.objects.create(order=order, menuitem=menuitem, quantity=i['quantity'])
-            orderitem.save()
-        cart_items.delete()
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, menuitem_id=i['menuitem_id'], quantity=i['quantity'])
+            for i in cart_items
+        ])
+        Cart.objects.filter(pk__in=[i['id'] for i in cart_items]).delete()
         return JsonResponse(status=201, data={'message':'Your order has been placed! Your order number is {}'.format(str(order.id))})
 
     def calculate_total(self, cart_items):
-        total = Decimal(0)
-        for item in cart_items:
-            total += item.price
-        return total
+        return sum((item['price'] for item in cart_items), Decimal(0))
 
 class SingleOrderView(generics.ListCreateAPIView):
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     serializer_class = SingleOrderSerializer
+    method_permissions = {
+        'PUT': _AUTHENTICATED_MANAGER_OR_ADMIN,
+        'DELETE': _AUTHENTICATED_MANAGER_OR_ADMIN,
+    }
+    default_permissions = (IsAuthenticated(), _DELIVERY_OR_MANAGER_OR_ADMIN())
     
     def get_permissions(self):
-        order = Order.objects.get(pk=self.kwargs['pk'])
-        if self.request.user == order.user and self.request.method == 'GET':
-            permission_classes = [IsAuthenticated]
-        elif self.request.method == 'PUT' or self.request.method == 'DELETE':
-            permission_classes = [IsAuthenticated, IsManager | IsAdminUser]
-        else:
-            permission_classes = [IsAuthenticated, IsDeliveryCrew | IsManager | IsAdminUser]
-        return[permission() for permission in permission_classes] 
+        if self.request.method == 'GET' and Order.objects.filter(pk=self.kwargs['pk'], user_id=self.request.user.id).exists():
+            return _AUTHENTICATED
+        return self.method_permissions.get(self.request.method, self.default_permissions)
 
     def get_queryset(self, *args, **kwargs):
-            query = OrderItem.objects.filter(order_id=self.kwargs['pk'])
+            query = OrderItem.objects.filter(order_id=self.kwargs['pk']).select_related('menuitem')
             return query
 
 
     def patch(self, request, *args, **kwargs):
-        order = Order.objects.get(pk=self.kwargs['pk'])
-        order.status = not order.status
-        order.save()
-        return JsonResponse(status=200, data={'message':'Status of order #'+ str(order.id)+' changed to '+str(order.status)})
+        Order.objects.filter(pk=self.kwargs['pk']).update(status=~F('status'))
+        order = get_object_or_404(Order.objects.values('id', 'status'), pk=self.kwargs['pk'])
+        return JsonResponse(status=200, data={'message':'Status of order #'+ str(order['id'])+' changed to '+str(order['status'])})
 
     def put(self, request, *args, **kwargs):
         serialized_item = OrderPutSerializer(data=request.data)
@@ -339,7 +389,7 @@ class SingleOrderView(generics.ListCreateAPIView):
         return JsonResponse(status=201, data={'message':str(crew.username)+' was assigned to order #'+str(order.id)})
 
     def delete(self, request, *args, **kwargs):
-        order = Order.objects.get(pk=self.kwargs['pk'])
-        order_number = str(order.id)
-        order.delete()
-        return JsonResponse(status=200, data={'message':'Order #{} was deleted'.format(order_number)})    
\ No newline at end of file
+        deleted, _ = Order.objects.filter(pk=self.kwargs['pk']).delete()
+        if not deleted:
+            raise Http404
+        return JsonResponse(status=200, data={'message':'Order #{} was deleted'.format(str(self.kwargs['pk']))})    
\ No newline at end of file